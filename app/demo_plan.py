@@ -1,15 +1,10 @@
-import json
 import random
 import networkx as nx
 
 from planning.astar_planner import NetworkXAStarPlanner
+from planning.graph_io import load_graph
 from task.cleaning_task_planner import plan_cleaning_tasks
 
-# --- VLM imports (INTENTIONALLY NOT USED AT RUNTIME) ---
-# Placeholders for future VLM/VLA integration
-from vlm.vlm_task_grounder import VLMTaskGrounder
-from task.cleaning_task_planner import plan_cleaning_tasks_from_vlm
-
 # --- OEM Abstraction (MOCK ONLY) ---
 from oem.mock_robot import MockRobot
 
@@ -17,9 +12,16 @@ from oem.mock_robot import MockRobot
 from ui.console import banner, section, log, ok, fail
 
 
-def simulate_edge_execution(edge):
+# --- VLM (INTENTIONALLY NOT USED AT RUNTIME) ---
+# Placeholder for future VLM/VLA integration. Imported lazily so a real
+# model stack is only loaded when grounding is actually enabled.
+def _load_vlm():
+    from vlm.vlm_task_grounder import VLMTaskGrounder
+    return VLMTaskGrounder()
+
+
+def simulate_edge_execution(reliability: float):
     """Simulate probabilistic execution success."""
-    reliability = edge.get("reliability", 1.0)
     return random.random() < reliability
 
 
@@ -29,8 +31,7 @@ def main():
     # -----------------------------
     # LOAD WORLD MODEL
     # -----------------------------
-    with open("world_model/topological_graph.json") as f:
-        graph = json.load(f)
+    graph = load_graph("world_model/topological_graph.json")
     log("World model loaded")
 
     # -----------------------------
@@ -48,7 +49,8 @@ def main():
     # for this challenge to ensure executability.
     #
     # Example (disabled):
-    # vlm = VLMTaskGrounder()
+    # from task.cleaning_task_planner import plan_cleaning_tasks_from_vlm
+    # vlm = _load_vlm()
     # vlm_output = vlm.ground_task("Clean the entrance area")
     # task_list = plan_cleaning_tasks_from_vlm(vlm_output, graph)
 
@@ -64,8 +66,7 @@ def main():
     planner = NetworkXAStarPlanner()
 
     context = {
-        "task": "clean",
-        "blocked_edges": []
+        "task": "clean"
     }
 
     current = "dock"
@@ -78,25 +79,27 @@ def main():
 
         while current != goal:
             try:
-                plan = planner.plan(graph, current, goal, context)
+                plan = planner.plan_with_tree(graph, current, goal, context)
             except nx.NetworkXNoPath:
                 fail(f"No path from {current} to {goal}, skipping zone")
                 break
 
-            next_edge = plan.edges[0]
-            log(f"Navigate {next_edge['from']} -> {next_edge['to']}")
+            # Lazy edge evaluation: commit to the optimistic path and only
+            # replan when an edge along it actually fails.
+            for i in range(len(plan.to_arr)):
+                next_from, next_to, next_reliab = plan.from_arr[i], plan.to_arr[i], plan.reliab_arr[i]
+                log(f"Navigate {next_from} -> {next_to}")
 
-            success = simulate_edge_execution(next_edge)
+                success = simulate_edge_execution(next_reliab)
 
-            if success:
-                ok(f"Reached {next_edge['to']}")
-                robot.navigate_to_node(next_edge["to"])
-                current = next_edge["to"]
-            else:
-                fail("Traversal failed, replanning")
-                context["blocked_edges"].append(
-                    (next_edge["from"], next_edge["to"])
-                )
+                if success:
+                    ok(f"Reached {next_to}")
+                    robot.navigate_to_node(next_to)
+                    current = next_to
+                else:
+                    fail("Traversal failed, replanning")
+                    planner.block_edge(next_from, next_to)
+                    break
 
         # -----------------------------
         # CLEANING EXECUTION (ABSTRACTED)
@@ -114,15 +117,15 @@ def main():
     if current != "dock":
         while current != "dock":
             try:
-                plan = planner.plan(graph, current, "dock", context)
+                plan = planner.plan_with_tree(graph, current, "dock", context)
             except nx.NetworkXNoPath:
                 fail("No path back to dock. Manual intervention required.")
                 return
 
-            next_edge = plan.edges[0]
-            log(f"Navigate {next_edge['from']} -> {next_edge['to']}")
-            robot.navigate_to_node(next_edge["to"])
-            current = next_edge["to"]
+            for next_from, next_to in zip(plan.from_arr, plan.to_arr):
+                log(f"Navigate {next_from} -> {next_to}")
+                robot.navigate_to_node(next_to)
+                current = next_to
 
     ok("Docked successfully")
     banner("Mission Complete")
@@ -0,0 +1,246 @@
+"""
+Numba-compiled A* over a CSR-encoded graph.
+
+Nodes are dense integers; the graph is given as `indptr` / `indices` /
+`weights` (successors of node u are indices[indptr[u]:indptr[u + 1]]).
+The heuristic is precomputed per goal into `h`, so the hot loop touches
+only flat arrays.
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def _heap_push(heap_f, heap_n, size, f, n):
+    i = size
+    heap_f[i] = f
+    heap_n[i] = n
+    while i > 0:
+        parent = (i - 1) >> 1
+        if heap_f[parent] <= heap_f[i]:
+            break
+        heap_f[parent], heap_f[i] = heap_f[i], heap_f[parent]
+        heap_n[parent], heap_n[i] = heap_n[i], heap_n[parent]
+        i = parent
+    return size + 1
+
+
+@njit(cache=True)
+def _heap_pop(heap_f, heap_n, size):
+    n = heap_n[0]
+    size -= 1
+    heap_f[0] = heap_f[size]
+    heap_n[0] = heap_n[size]
+
+    i = 0
+    while True:
+        left = 2 * i + 1
+        if left >= size:
+            break
+        child = left
+        if left + 1 < size and heap_f[left + 1] < heap_f[left]:
+            child = left + 1
+        if heap_f[i] <= heap_f[child]:
+            break
+        heap_f[child], heap_f[i] = heap_f[i], heap_f[child]
+        heap_n[child], heap_n[i] = heap_n[i], heap_n[child]
+        i = child
+    return n, size
+
+
+@njit(cache=True)
+def _reconstruct(parent, g, start, goal):
+    if g[goal] == np.inf:
+        return np.empty(0, dtype=np.int64)
+
+    length = 1
+    node = goal
+    while node != start:
+        node = parent[node]
+        length += 1
+
+    path = np.empty(length, dtype=np.int64)
+    node = goal
+    for i in range(length - 1, -1, -1):
+        path[i] = node
+        node = parent[node]
+    return path
+
+
+@njit(cache=True)
+def astar_csr(indptr, indices, weights, h, start, goal):
+    """
+    Returns the node path start..goal as an int64 array, or an empty
+    array if goal is unreachable.
+    """
+    n_nodes = indptr.shape[0] - 1
+
+    g = np.full(n_nodes, np.inf)
+    parent = np.full(n_nodes, -1, dtype=np.int64)
+    closed = np.zeros(n_nodes, dtype=np.bool_)
+
+    # Lazy-deletion heap: every successful relaxation pushes once
+    capacity = indices.shape[0] + 1
+    heap_f = np.empty(capacity, dtype=np.float64)
+    heap_n = np.empty(capacity, dtype=np.int64)
+
+    g[start] = 0.0
+    size = _heap_push(heap_f, heap_n, 0, h[start], start)
+
+    while size > 0:
+        u, size = _heap_pop(heap_f, heap_n, size)
+        if closed[u]:
+            continue
+        if u == goal:
+            break
+        closed[u] = True
+
+        g_u = g[u]
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            g_v = g_u + weights[k]
+            if g_v < g[v]:
+                g[v] = g_v
+                parent[v] = u
+                size = _heap_push(heap_f, heap_n, size, g_v + h[v], v)
+
+    return _reconstruct(parent, g, start, goal)
+
+
+@njit(cache=True)
+def dijkstra_csr(indptr, indices, weights, start):
+    """
+    Single-source Dijkstra; returns the shortest-path tree as a parent
+    array (-1 for the root and for unreachable nodes).
+    """
+    n_nodes = indptr.shape[0] - 1
+
+    g = np.full(n_nodes, np.inf)
+    parent = np.full(n_nodes, -1, dtype=np.int64)
+    closed = np.zeros(n_nodes, dtype=np.bool_)
+
+    capacity = indices.shape[0] + 1
+    heap_f = np.empty(capacity, dtype=np.float64)
+    heap_n = np.empty(capacity, dtype=np.int64)
+
+    g[start] = 0.0
+    size = _heap_push(heap_f, heap_n, 0, 0.0, start)
+
+    while size > 0:
+        u, size = _heap_pop(heap_f, heap_n, size)
+        if closed[u]:
+            continue
+        closed[u] = True
+
+        g_u = g[u]
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            g_v = g_u + weights[k]
+            if g_v < g[v]:
+                g[v] = g_v
+                parent[v] = u
+                size = _heap_push(heap_f, heap_n, size, g_v, v)
+
+    return parent
+
+
+@njit(cache=True)
+def _bidir_expand(indptr, indices, weights, sign, potential, dist, parent, closed,
+                  heap_f, heap_n, size, other_dist, best, meet):
+    # One extract-min + relaxation on one side of the bidirectional search
+    u, size = _heap_pop(heap_f, heap_n, size)
+    if closed[u]:
+        return size, best, meet
+    closed[u] = True
+
+    d_u = dist[u]
+    for k in range(indptr[u], indptr[u + 1]):
+        v = indices[k]
+        d_v = d_u + weights[k]
+        if d_v < dist[v]:
+            dist[v] = d_v
+            parent[v] = u
+            size = _heap_push(heap_f, heap_n, size, d_v + sign * potential[v], v)
+        if d_v + other_dist[v] < best:
+            best = d_v + other_dist[v]
+            meet = v
+    return size, best, meet
+
+
+@njit(cache=True)
+def bidir_astar_csr(indptr, indices, weights, indptr_r, indices_r, weights_r,
+                    h_goal, h_start, start, goal):
+    """
+    Bidirectional A* over a CSR graph and its transpose. h_goal / h_start
+    are heuristic distances to goal / from start; both searches use the
+    average potential (h_goal - h_start) / 2. Returns the node path or an
+    empty array if goal is unreachable.
+    """
+    n_nodes = indptr.shape[0] - 1
+    potential = 0.5 * (h_goal - h_start)
+
+    dist_f = np.full(n_nodes, np.inf)
+    dist_r = np.full(n_nodes, np.inf)
+    parent_f = np.full(n_nodes, -1, dtype=np.int64)
+    parent_r = np.full(n_nodes, -1, dtype=np.int64)
+    closed_f = np.zeros(n_nodes, dtype=np.bool_)
+    closed_r = np.zeros(n_nodes, dtype=np.bool_)
+
+    capacity = indices.shape[0] + 1
+    heap_ff = np.empty(capacity, dtype=np.float64)
+    heap_fn = np.empty(capacity, dtype=np.int64)
+    heap_rf = np.empty(capacity, dtype=np.float64)
+    heap_rn = np.empty(capacity, dtype=np.int64)
+
+    dist_f[start] = 0.0
+    dist_r[goal] = 0.0
+    size_f = _heap_push(heap_ff, heap_fn, 0, potential[start], start)
+    size_r = _heap_push(heap_rf, heap_rn, 0, -potential[goal], goal)
+
+    best = np.inf
+    meet = -1
+    forward = True
+
+    while size_f > 0 and size_r > 0:
+        # Neither frontier can produce a shorter start-goal path
+        if heap_ff[0] + heap_rf[0] >= best:
+            break
+
+        if forward:
+            size_f, best, meet = _bidir_expand(
+                indptr, indices, weights, 1.0, potential, dist_f, parent_f, closed_f,
+                heap_ff, heap_fn, size_f, dist_r, best, meet
+            )
+        else:
+            size_r, best, meet = _bidir_expand(
+                indptr_r, indices_r, weights_r, -1.0, potential, dist_r, parent_r, closed_r,
+                heap_rf, heap_rn, size_r, dist_f, best, meet
+            )
+        forward = not forward
+
+    if meet == -1:
+        return np.empty(0, dtype=np.int64)
+
+    n_front = 1
+    node = meet
+    while node != start:
+        node = parent_f[node]
+        n_front += 1
+    n_back = 0
+    node = meet
+    while node != goal:
+        node = parent_r[node]
+        n_back += 1
+
+    path = np.empty(n_front + n_back, dtype=np.int64)
+    node = meet
+    for i in range(n_front - 1, -1, -1):
+        path[i] = node
+        node = parent_f[node]
+    node = meet
+    for i in range(n_front, n_front + n_back):
+        node = parent_r[node]
+        path[i] = node
+    return path
+
@@ -1,30 +1,402 @@
-from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+from functools import partial
+import math
+from heapq import heappop, heappush
+from itertools import count
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple
 import networkx as nx
+import numpy as np
 
 from planning.planner_interface import Planner, PlanResult
-from planning.costs import compute_edge_cost
+from planning.costs import (
+    compute_static_edge_costs,
+    edge_cost_arrays,
+    finalize_edge_cost,
+    finalize_edge_costs,
+)
+
+try:
+    from planning.astar_numba import astar_csr, bidir_astar_csr, dijkstra_csr
+except ImportError:  # numba is optional; fall back to the pure-Python search
+    astar_csr = bidir_astar_csr = dijkstra_csr = None
+
+
+EdgeId = Tuple[str, str]
+
+
+@dataclass
+class _CachedGraph:
+    source: Dict[str, Any]  # keeps id(source) from being reused while cached
+    G: nx.DiGraph
+    node_by_id: Dict[str, Dict[str, Any]]
+    # Edges are addressed by their position in graph["edges"]
+    edge_index: Dict[EdgeId, int]
+    edge_data: List[Dict[str, Any]]  # G's attribute dict per edge, patched in place
+    edge_views: Dict[EdgeId, Mapping[str, Any]]  # read-only payloads handed to callers
+    edge_reliability: List[float]
+    edge_skill: List[Optional[str]]
+    static_cost: np.ndarray  # unclamped static cost per edge
+    # Integer-indexed CSR copy of G for the compiled search
+    node_ids: List[str]
+    node_index: Dict[str, int]
+    indptr: np.ndarray
+    indices: np.ndarray
+    csr_weights: np.ndarray
+    csr_slot: np.ndarray  # edge position -> CSR slot, -1 for shadowed duplicates
+    indptr_r: np.ndarray
+    indices_r: np.ndarray
+    csr_weights_r: np.ndarray
+    rev_slot: np.ndarray  # forward CSR slot -> transpose CSR slot
+    # Blocked edges by position in graph["edges"]: all of them, and the
+    # subset reported through block_edge()
+    blocked: Set[int] = field(default_factory=set)
+    planner_blocked: Set[int] = field(default_factory=set)
+    reverse: Optional[nx.DiGraph] = None  # G^R, built on first bidirectional search
+    # Node positions and the cheapest cost per unit distance over all edges;
+    # None when the world model carries no geometry
+    coords: Optional[Dict[str, Tuple[float, float]]] = None
+    min_cost_per_m: float = 0.0
+    xy: Optional[np.ndarray] = None  # coords in node_index order
+    # h(u, v) memo; the heuristic is fixed for a graph, so replans reuse it
+    h_cache: Dict[EdgeId, float] = field(default_factory=dict)
+    # Per-goal heuristic arrays for the compiled search
+    h_arrays: Dict[str, np.ndarray] = field(default_factory=dict)
+    # Shortest-path tree (parent array) from tree_root; dropped on any block change
+    tree_root: Optional[str] = None
+    tree_parent: Optional[np.ndarray] = None
+
+
+def _node_coords(nodes: List[Dict[str, Any]]) -> Optional[Dict[str, Tuple[float, float]]]:
+    coords = {}
+    for n in nodes:
+        if "x" not in n or "y" not in n:
+            return None
+        coords[n["id"]] = (float(n["x"]), float(n["y"]))
+    return coords
+
+
+def _min_cost_per_m(
+    coords: Dict[str, Tuple[float, float]],
+    edges: List[Dict[str, Any]],
+    static_cost: np.ndarray
+) -> float:
+    """
+    Smallest unblocked weight per metre over all edges. Scaling euclidean
+    distance by this keeps the heuristic admissible (and consistent), since
+    blocks only ever add cost.
+    """
+    src = np.array([coords[e["from"]] for e in edges], dtype=np.float64).reshape(-1, 2)
+    dst = np.array([coords[e["to"]] for e in edges], dtype=np.float64).reshape(-1, 2)
+    dist = np.hypot(*(dst - src).T)
+
+    moving = dist > 0.0
+    if not moving.any():
+        return 0.0
+    return float(np.min(finalize_edge_costs(static_cost)[moving] / dist[moving]))
+
+
+def _build_csr(
+    G: nx.DiGraph,
+    graph: Dict[str, Any],
+    edge_index: Dict[EdgeId, int],
+    weights: np.ndarray
+) -> Dict[str, Any]:
+    """
+    Integer CSR encoding of G plus its transpose (G^R), as _CachedGraph
+    fields. Both are built once per cached graph. Reuses the dense id
+    table from graph_io.intern_graph when the world model carries one.
+    """
+    edges = graph["edges"]
+    node_ids = graph.get("_node_ids")
+    node_index = graph.get("_node_index")
+    if node_ids is None or node_index is None or len(node_ids) != G.number_of_nodes():
+        node_ids = list(G.nodes)
+        node_index = {node_id: i for i, node_id in enumerate(node_ids)}
+    n_nodes = len(node_ids)
+
+    # Repeated (from, to) pairs collapse onto the last one, as in G
+    unique = np.fromiter(sorted(edge_index.values()), dtype=np.int64, count=len(edge_index))
+    src = np.fromiter((node_index[edges[i]["from"]] for i in unique), dtype=np.int64, count=len(unique))
+    dst = np.fromiter((node_index[edges[i]["to"]] for i in unique), dtype=np.int64, count=len(unique))
+
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n_nodes), out=indptr[1:])
+    indices = dst[order]
+    csr_weights = weights[unique[order]]
+
+    csr_slot = np.full(len(edges), -1, dtype=np.int64)
+    csr_slot[unique[order]] = np.arange(len(unique))
+
+    # Transpose: row v lists the predecessors of v
+    order_r = np.argsort(indices, kind="stable")
+    indptr_r = np.zeros(n_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(indices, minlength=n_nodes), out=indptr_r[1:])
+    rev_slot = np.empty(len(unique), dtype=np.int64)
+    rev_slot[order_r] = np.arange(len(unique))
+
+    return {
+        "node_ids": node_ids,
+        "node_index": node_index,
+        "indptr": indptr,
+        "indices": indices,
+        "csr_weights": csr_weights,
+        "csr_slot": csr_slot,
+        "indptr_r": indptr_r,
+        "indices_r": src[order][order_r],
+        "csr_weights_r": csr_weights[order_r],
+        "rev_slot": rev_slot,
+    }
+
+
+def _fast_astar_path(
+    G: nx.DiGraph,
+    source: str,
+    target: str,
+    heuristic: Optional[Callable[[str, str], float]] = None,
+    weight: str = "weight",
+    enqueued: Optional[Dict[str, Tuple[float, float]]] = None,
+    explored: Optional[Dict[str, Optional[str]]] = None
+) -> List[str]:
+    """
+    nx.astar_path without the per-call backend dispatch and per-edge
+    weight-function indirection: neighbours come straight from G._adj and
+    weights are read from the edge dict.
+
+    `enqueued` / `explored` may be passed in to reuse their storage across
+    calls; they are cleared before the search.
+    """
+    if source not in G:
+        raise nx.NodeNotFound(f"Source {source} is not in G")
+    if target not in G:
+        raise nx.NodeNotFound(f"Target {target} is not in G")
+
+    if heuristic is None:
+        def heuristic(u, v):
+            return 0.0
+
+    G_succ = G._adj
+    c = count()
+    # (priority, tie-breaker, node, cost to reach, parent)
+    queue = [(0.0, next(c), source, 0.0, None)]
+    # node -> (cost of best discovered path, heuristic to target)
+    if enqueued is None:
+        enqueued = {}
+    else:
+        enqueued.clear()
+    # node -> parent closest to the source
+    if explored is None:
+        explored = {}
+    else:
+        explored.clear()
+
+    while queue:
+        _, __, curnode, dist, parent = heappop(queue)
+
+        if curnode == target:
+            path = [curnode]
+            node = parent
+            while node is not None:
+                path.append(node)
+                node = explored[node]
+            path.reverse()
+            return path
+
+        if curnode in explored:
+            # Do not override the parent of starting node
+            if explored[curnode] is None:
+                continue
+            # Skip bad paths that were enqueued before finding a better one
+            qcost, h = enqueued[curnode]
+            if qcost < dist:
+                continue
+
+        explored[curnode] = parent
+
+        for neighbor, w in G_succ[curnode].items():
+            ncost = dist + w.get(weight, 1)
+            if neighbor in enqueued:
+                qcost, h = enqueued[neighbor]
+                if qcost <= ncost:
+                    continue
+            else:
+                h = heuristic(neighbor, target)
+            enqueued[neighbor] = ncost, h
+            heappush(queue, (ncost + h, next(c), neighbor, ncost, curnode))
+
+    raise nx.NetworkXNoPath(f"Node {target} not reachable from {source}")
 
 
 class NetworkXAStarPlanner(Planner):
-    def _build_nx_graph(self, graph: Dict[str, Any], context: Optional[Dict[str, Any]]) -> nx.DiGraph:
+    def __init__(self):
+        # Graphs are rebuilt only when the world model or the static part of
+        # the context (task, crowded) changes; blocks are patched in place.
+        self._graph_cache: Dict[Tuple[int, Any, bool], _CachedGraph] = {}
+        # Edges found infeasible during execution; applies to every graph
+        self.blocked: Set[EdgeId] = set()
+        # Scratch tables for the pure-Python search, kept across replans so
+        # their hash tables are not regrown every call
+        self._enq: Dict[str, Tuple[float, float]] = {}
+        self._expl: Dict[str, Optional[str]] = {}
+
+    def _build_nx_graph(self, graph: Dict[str, Any], context: Optional[Dict[str, Any]]) -> _CachedGraph:
         G = nx.DiGraph()
 
         nodes = graph["nodes"]
         edges = graph["edges"]
 
-        node_by_id = {n["id"]: n for n in nodes}
+        # Attached at load time by graph_io.intern_graph
+        node_by_id = graph.get("_node_by_id") or {n["id"]: n for n in nodes}
+
+        # One vectorized pass over all edges instead of a cost call per edge
+        cost_arrays = edge_cost_arrays(edges, node_by_id)
+        static_cost = compute_static_edge_costs(cost_arrays, context=context)
+        weights = finalize_edge_costs(static_cost)
 
         for n in nodes:
             G.add_node(n["id"], **n)
 
-        for e in edges:
-            cost = compute_edge_cost(e, node_by_id=node_by_id, context=context)
+        for e, cost in zip(edges, weights.tolist()):
             # store full edge payload for downstream execution
             edge_payload = dict(e)
             edge_payload["cost"] = cost
             G.add_edge(e["from"], e["to"], **edge_payload, weight=cost)
 
-        return G
+        edge_index = {(e["from"], e["to"]): i for i, e in enumerate(edges)}
+        cached = _CachedGraph(
+            source=graph,
+            G=G,
+            node_by_id=node_by_id,
+            edge_index=edge_index,
+            edge_data=[G._adj[e["from"]][e["to"]] for e in edges],
+            edge_views={(u, v): MappingProxyType(data) for u, v, data in G.edges(data=True)},
+            edge_reliability=cost_arrays["reliability"].tolist(),
+            edge_skill=[e.get("skill") for e in edges],
+            static_cost=static_cost,
+            **_build_csr(G, graph, edge_index, weights),
+        )
+
+        for edge_id in self.blocked:
+            i = edge_index.get(edge_id)
+            if i is not None:
+                cached.planner_blocked.add(i)
+                self._set_edge_blocked(cached, i, blocked=True)
+
+        coords = _node_coords(nodes)
+        if coords is not None and len(coords) == len(cached.node_ids):
+            cached.coords = coords
+            cached.min_cost_per_m = _min_cost_per_m(coords, edges, static_cost)
+            cached.xy = np.array([coords[n] for n in cached.node_ids], dtype=np.float64)
+
+        return cached
+
+    def _get_cached_graph(self, graph: Dict[str, Any], context: Optional[Dict[str, Any]]) -> _CachedGraph:
+        context = context or {}
+        key = (id(graph), context.get("task", "navigate"), bool(context.get("crowded", False)))
+
+        cached = self._graph_cache.get(key)
+        if cached is None:
+            cached = self._build_nx_graph(graph, context=context)
+            self._graph_cache[key] = cached
+
+        return cached
+
+    def _set_edge_blocked(self, cached: _CachedGraph, i: int, blocked: bool) -> None:
+        cost = finalize_edge_cost(float(cached.static_cost[i]), blocked=blocked)
+        data = cached.edge_data[i]
+        data["cost"] = cost
+        data["weight"] = cost
+        slot = cached.csr_slot[i]
+        if slot >= 0:
+            cached.csr_weights[slot] = cost
+            cached.csr_weights_r[cached.rev_slot[slot]] = cost
+
+        if blocked:
+            cached.blocked.add(i)
+        else:
+            cached.blocked.discard(i)
+        cached.tree_root = cached.tree_parent = None
+
+    def _sync_blocked_edges(self, cached: _CachedGraph, context: Optional[Dict[str, Any]]) -> None:
+        context = context or {}
+        blocked = cached.planner_blocked
+
+        context_blocked = context.get("blocked_edges")
+        if context_blocked:
+            edge_index = cached.edge_index
+            blocked = blocked | {
+                edge_index[e] for e in map(tuple, context_blocked) if e in edge_index
+            }
+
+        if blocked == cached.blocked:
+            return
+        for i in cached.blocked - blocked:
+            self._set_edge_blocked(cached, i, blocked=False)
+        for i in blocked - cached.blocked:
+            self._set_edge_blocked(cached, i, blocked=True)
+
+    def block_edge(self, u: str, v: str) -> None:
+        """
+        Lazily invalidate a single edge: the penalty is patched into every
+        cached graph so the next plan() is a plain A* call, no rebuild.
+        """
+        edge_id = (u, v)
+        self.blocked.add(edge_id)
+
+        for cached in self._graph_cache.values():
+            i = cached.edge_index.get(edge_id)
+            if i is None:
+                continue
+            cached.planner_blocked.add(i)
+            if i not in cached.blocked:
+                self._set_edge_blocked(cached, i, blocked=True)
+
+    def _heuristic(self, cached: _CachedGraph, u: str, v: str) -> float:
+        # Without node geometry A* degenerates to Dijkstra
+        if cached.coords is None:
+            return 0.0
+
+        h = cached.h_cache.get((u, v))
+        if h is None:
+            h = cached.min_cost_per_m * math.dist(cached.coords[u], cached.coords[v])
+            cached.h_cache[(u, v)] = h
+        return h
+
+    def _goal_h(self, cached: _CachedGraph, goal: str) -> np.ndarray:
+        h = cached.h_arrays.get(goal)
+        if h is None:
+            if cached.xy is None:
+                h = np.zeros(len(cached.node_ids))
+            else:
+                delta = cached.xy - cached.xy[cached.node_index[goal]]
+                h = cached.min_cost_per_m * np.hypot(delta[:, 0], delta[:, 1])
+            cached.h_arrays[goal] = h
+        return h
+
+    def _search(self, cached: _CachedGraph, start: str, goal: str) -> List[str]:
+        if astar_csr is not None:
+            for n in (start, goal):
+                if n not in cached.node_index:
+                    raise nx.NodeNotFound(f"Node {n} is not in G")
+
+            path = astar_csr(
+                cached.indptr,
+                cached.indices,
+                cached.csr_weights,
+                self._goal_h(cached, goal),
+                cached.node_index[start],
+                cached.node_index[goal],
+            )
+            if len(path) == 0:
+                raise nx.NetworkXNoPath(f"Node {goal} not reachable from {start}")
+            return [cached.node_ids[i] for i in path.tolist()]
+
+        heuristic = partial(self._heuristic, cached) if cached.coords is not None else None
+        return _fast_astar_path(
+            cached.G, start, goal, heuristic=heuristic, weight="weight",
+            enqueued=self._enq, explored=self._expl
+        )
 
     def plan(
         self,
@@ -33,12 +405,190 @@ class NetworkXAStarPlanner(Planner):
         goal: str,
         context: Optional[Dict[str, Any]] = None
     ) -> PlanResult:
-        G = self._build_nx_graph(graph, context=context)
+        cached = self._get_cached_graph(graph, context=context)
+        self._sync_blocked_edges(cached, context=context)
+
+        node_path = self._search(cached, start, goal)
+
+        return self._plan_result(cached, node_path)
+
+    def _plan_result(self, cached: _CachedGraph, node_path: List[str]) -> PlanResult:
+        from_arr = tuple(node_path[:-1])
+        to_arr = tuple(node_path[1:])
+        edge_index = cached.edge_index
+        idx = [edge_index[e] for e in zip(from_arr, to_arr)]
+
+        edge_data = cached.edge_data
+        edge_views = cached.edge_views
+        reliability = cached.edge_reliability
+        skill = cached.edge_skill
+
+        return PlanResult(
+            nodes=tuple(node_path),
+            from_arr=from_arr,
+            to_arr=to_arr,
+            reliab_arr=tuple([reliability[i] for i in idx]),
+            skill_arr=tuple([skill[i] for i in idx]),
+            cost_arr=tuple([edge_data[i]["cost"] for i in idx]),
+            edges=tuple([edge_views[e] for e in zip(from_arr, to_arr)]),
+        )
+
+    def _shortest_path_tree(self, cached: _CachedGraph, start: str) -> np.ndarray:
+        if dijkstra_csr is not None:
+            return dijkstra_csr(cached.indptr, cached.indices, cached.csr_weights, cached.node_index[start])
+
+        pred, _ = nx.dijkstra_predecessor_and_distance(cached.G, start, weight="weight")
+        parent = np.full(len(cached.node_ids), -1, dtype=np.int64)
+        for v, us in pred.items():
+            if us:
+                parent[cached.node_index[v]] = cached.node_index[us[0]]
+        return parent
+
+    def plan_with_tree(
+        self,
+        graph: Dict[str, Any],
+        start: str,
+        goal: str,
+        context: Optional[Dict[str, Any]] = None
+    ) -> PlanResult:
+        """
+        Like plan(), but answered from one single-source Dijkstra tree
+        rooted at `start`. The tree is kept until start moves or an edge
+        block changes, so queries for several goals from the same node
+        cost one search plus a parent walk each.
+        """
+        cached = self._get_cached_graph(graph, context=context)
+        self._sync_blocked_edges(cached, context=context)
+
+        for n in (start, goal):
+            if n not in cached.node_index:
+                raise nx.NodeNotFound(f"Node {n} is not in G")
+
+        if cached.tree_root != start:
+            cached.tree_parent = self._shortest_path_tree(cached, start)
+            cached.tree_root = start
+
+        parent = cached.tree_parent
+        node = cached.node_index[goal]
+        root = cached.node_index[start]
+        path = [node]
+        while node != root:
+            node = int(parent[node])
+            if node < 0:
+                raise nx.NetworkXNoPath(f"Node {goal} not reachable from {start}")
+            path.append(node)
+        path.reverse()
+
+        return self._plan_result(cached, [cached.node_ids[i] for i in path])
+
+
+class BidirectionalAStarPlanner(NetworkXAStarPlanner):
+    """
+    Bidirectional A*: alternates a forward search from start and a
+    reverse search from goal, stopping once the frontiers can no longer
+    improve the best meeting point. Uses the average potential
+    p(v) = (h(v, goal) - h(start, v)) / 2 so both searches stay
+    consistent with a shared heuristic.
+
+    Falls back to unidirectional A* when the heuristic estimate between
+    start and goal is below `min_estimate` (short hops gain nothing from
+    the second frontier).
+    """
+
+    def __init__(self, min_estimate: float = 0.0):
+        super().__init__()
+        self.min_estimate = min_estimate
+
+    def _reverse_graph(self, cached: _CachedGraph) -> nx.DiGraph:
+        # A view shares edge data with G, so blocked-edge patches apply to both
+        if cached.reverse is None:
+            cached.reverse = cached.G.reverse(copy=False)
+        return cached.reverse
+
+    def _search(self, cached: _CachedGraph, start: str, goal: str) -> List[str]:
+        G = cached.G
+        for n in (start, goal):
+            if n not in G:
+                raise nx.NodeNotFound(f"Node {n} is not in G")
+
+        if start == goal:
+            return [start]
+        if self._heuristic(cached, start, goal) < self.min_estimate:
+            return super()._search(cached, start, goal)
+
+        if bidir_astar_csr is not None:
+            path = bidir_astar_csr(
+                cached.indptr,
+                cached.indices,
+                cached.csr_weights,
+                cached.indptr_r,
+                cached.indices_r,
+                cached.csr_weights_r,
+                self._goal_h(cached, goal),
+                self._goal_h(cached, start),
+                cached.node_index[start],
+                cached.node_index[goal],
+            )
+            if len(path) == 0:
+                raise nx.NetworkXNoPath(f"Node {goal} not reachable from {start}")
+            return [cached.node_ids[i] for i in path.tolist()]
+
+        def potential(v: str) -> float:
+            return 0.5 * (self._heuristic(cached, v, goal) - self._heuristic(cached, start, v))
+
+        adj = (G._adj, self._reverse_graph(cached)._adj)
+        sign = (1.0, -1.0)
+        tie = count()
+
+        dist: Tuple[Dict[str, float], Dict[str, float]] = ({start: 0.0}, {goal: 0.0})
+        came_from: Tuple[Dict[str, Optional[str]], Dict[str, Optional[str]]] = ({start: None}, {goal: None})
+        closed: Tuple[Set[str], Set[str]] = (set(), set())
+        open_set: Tuple[list, list] = (
+            [(potential(start), next(tie), start)],
+            [(-potential(goal), next(tie), goal)],
+        )
+
+        best = float("inf")
+        meet: Optional[str] = None
+        side = 0
+
+        while open_set[0] and open_set[1]:
+            # Neither frontier can produce a shorter start-goal path
+            if open_set[0][0][0] + open_set[1][0][0] >= best:
+                break
+
+            _, _, u = heappop(open_set[side])
+            if u not in closed[side]:
+                closed[side].add(u)
+                d_u = dist[side][u]
+                other = dist[1 - side]
+
+                for v, data in adj[side][u].items():
+                    d_v = d_u + data["weight"]
+                    if d_v < dist[side].get(v, float("inf")):
+                        dist[side][v] = d_v
+                        came_from[side][v] = u
+                        heappush(open_set[side], (d_v + sign[side] * potential(v), next(tie), v))
+                    if v in other and d_v + other[v] < best:
+                        best = d_v + other[v]
+                        meet = v
+
+            side = 1 - side
+
+        if meet is None:
+            raise nx.NetworkXNoPath(f"Node {goal} not reachable from {start}")
+
+        path: List[str] = []
+        node: Optional[str] = meet
+        while node is not None:
+            path.append(node)
+            node = came_from[0][node]
+        path.reverse()
 
-        node_path: List[str] = nx.astar_path(G, start, goal, weight="weight")
+        node = came_from[1][meet]
+        while node is not None:
+            path.append(node)
+            node = came_from[1][node]
 
-        edge_path: List[Dict[str, Any]] = []
-        for u, v in zip(node_path[:-1], node_path[1:]):
-            edge_path.append(dict(G.edges[u, v]))
+        return path
 
-        return PlanResult(nodes=node_path, edges=edge_path)
@@ -1,4 +1,6 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+
+import numpy as np
 
 
 PRIORITY_TO_PENALTY = {
@@ -7,12 +9,19 @@ PRIORITY_TO_PENALTY = {
     "low": 0.2
 }
 
+MIN_EDGE_COST = 0.01
+BLOCKED_EDGE_PENALTY = 100.0  # effectively disables an edge
 
-def compute_edge_cost(
+
+def compute_static_edge_cost(
     edge: Dict[str, Any],
     node_by_id: Dict[str, Dict[str, Any]],
     context: Optional[Dict[str, Any]] = None
 ) -> float:
+    """
+    Cost terms that stay fixed for a mission (everything except
+    temporary blocks). Returned unclamped; see finalize_edge_cost.
+    """
     context = context or {}
     task = context.get("task", "navigate")
 
@@ -37,10 +46,96 @@ def compute_edge_cost(
     reliability = edge.get("reliability", 1.0)
     cost += (1.0 - reliability) * 3.0
 
+    return cost
+
+
+def finalize_edge_cost(static_cost: float, blocked: bool = False) -> float:
+    """
+    Apply the temporary block penalty and clamp to a positive weight.
+    """
+    cost = static_cost
+    if blocked:
+        cost += BLOCKED_EDGE_PENALTY
+    return max(MIN_EDGE_COST, cost)
+
+
+def compute_edge_cost(
+    edge: Dict[str, Any],
+    node_by_id: Dict[str, Dict[str, Any]],
+    context: Optional[Dict[str, Any]] = None
+) -> float:
+    context = context or {}
+    cost = compute_static_edge_cost(edge, node_by_id=node_by_id, context=context)
+
     # Temporary block from failed execution
     blocked = context.get("blocked_edges", [])
     edge_id = (edge["from"], edge["to"])
-    if edge_id in blocked:
-        cost += 100.0  # effectively disables this edge
 
-    return max(0.01, cost)
\ No newline at end of file
+    return finalize_edge_cost(cost, blocked=edge_id in blocked)
+
+
+# -------------------------------
+# VECTORIZED (SoA) COST MODEL
+# -------------------------------
+
+def edge_cost_arrays(
+    edges: List[Dict[str, Any]],
+    node_by_id: Dict[str, Dict[str, Any]]
+) -> Dict[str, np.ndarray]:
+    """
+    Struct-of-arrays view of the per-edge inputs to compute_static_edge_cost,
+    indexed by position in `edges`. Built once per world model.
+    """
+    n = len(edges)
+    return {
+        "base_cost": np.fromiter(
+            (float(e.get("base_cost", 1.0)) for e in edges), dtype=np.float64, count=n
+        ),
+        "reliability": np.fromiter(
+            (float(e.get("reliability", 1.0)) for e in edges), dtype=np.float64, count=n
+        ),
+        "priority_penalty": np.fromiter(
+            (PRIORITY_TO_PENALTY.get(node_by_id.get(e["to"], {}).get("priority"), 0.0) for e in edges),
+            dtype=np.float64, count=n
+        ),
+        "is_enter_zone": np.fromiter(
+            (e.get("skill") == "enter_zone" for e in edges), dtype=bool, count=n
+        ),
+    }
+
+
+def compute_static_edge_costs(
+    arrays: Dict[str, np.ndarray],
+    context: Optional[Dict[str, Any]] = None
+) -> np.ndarray:
+    """
+    compute_static_edge_cost over every edge in one pass. Same terms, same
+    order of operations, so results match the scalar version exactly.
+    """
+    context = context or {}
+    task = context.get("task", "navigate")
+
+    cost = arrays["base_cost"].copy()
+
+    if task == "clean":
+        cost += arrays["priority_penalty"]
+
+    if context.get("crowded", False):
+        cost += np.where(arrays["is_enter_zone"], 0.3, 0.0)
+
+    cost += (1.0 - arrays["reliability"]) * 3.0
+
+    return cost
+
+
+def finalize_edge_costs(
+    static_costs: np.ndarray,
+    blocked: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Vectorized finalize_edge_cost; `blocked` is a boolean mask over edges.
+    """
+    cost = static_costs
+    if blocked is not None:
+        cost = cost + np.where(blocked, BLOCKED_EDGE_PENALTY, 0.0)
+    return np.maximum(MIN_EDGE_COST, cost)
@@ -0,0 +1,49 @@
+import json
+import sys
+from typing import Any, Dict
+
+
+def intern_graph(graph: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Intern every node id (and edge endpoint) in place and attach lookup
+    tables:
+
+        graph["_node_ids"]   int -> node id
+        graph["_node_index"] node id -> int
+        graph["_node_by_id"] node id -> node record
+
+    Ids are numbered nodes first, then any endpoint that only appears in
+    an edge, which is also the order planners see them in.
+    """
+    node_ids = []
+    node_index: Dict[str, int] = {}
+
+    def intern_id(node_id: str) -> str:
+        node_id = sys.intern(node_id)
+        if node_id not in node_index:
+            node_index[node_id] = len(node_ids)
+            node_ids.append(node_id)
+        return node_id
+
+    node_by_id: Dict[str, Dict[str, Any]] = {}
+    for n in graph["nodes"]:
+        n["id"] = intern_id(n["id"])
+        node_by_id[n["id"]] = n
+
+    for e in graph["edges"]:
+        e["from"] = intern_id(e["from"])
+        e["to"] = intern_id(e["to"])
+
+    graph["_node_ids"] = node_ids
+    graph["_node_index"] = node_index
+    graph["_node_by_id"] = node_by_id
+    return graph
+
+
+def load_graph(path: str) -> Dict[str, Any]:
+    """
+    Load a topological world model from JSON with interned ids.
+    """
+    with open(path) as f:
+        graph = json.load(f)
+    return intern_graph(graph)
@@ -0,0 +1,192 @@
+from dataclasses import dataclass, field
+from heapq import heappop, heappush
+from itertools import count
+import math
+from typing import Any, Dict, List, Optional, Set, Tuple
+import networkx as nx
+
+from planning.astar_planner import NetworkXAStarPlanner, _CachedGraph
+from planning.planner_interface import PlanResult
+
+
+INF = float("inf")
+Key = Tuple[float, float]
+
+# Keys are sums of float costs and heuristics; components this close are ties
+KEY_RTOL = 1e-9
+
+
+def _key_le(a: Key, b: Key) -> bool:
+    """
+    a <= b with near-equal components treated as equal. Rounding can put
+    a tied key a hair above key(start); counting it as a tie keeps the
+    vertex in the search, which only costs an extra expansion.
+    """
+    if not math.isclose(a[0], b[0], rel_tol=KEY_RTOL):
+        return a[0] < b[0]
+    return a[1] <= b[1] or math.isclose(a[1], b[1], rel_tol=KEY_RTOL)
+
+
+@dataclass
+class _LPAState:
+    goal: str
+    last_start: str
+    km: float = 0.0
+    g: Dict[str, float] = field(default_factory=dict)
+    rhs: Dict[str, float] = field(default_factory=dict)
+    open_heap: List[Tuple[Key, int, str]] = field(default_factory=list)
+    open_key: Dict[str, Key] = field(default_factory=dict)  # live entries of open_heap
+    changed: Set[Tuple[str, str]] = field(default_factory=set)  # edges patched since last plan
+    tie: Any = field(default_factory=count)
+
+
+class LifelongAStarPlanner(NetworkXAStarPlanner):
+    """
+    Incremental planner that keeps its search state between replans.
+
+    Runs LPA* backwards from the goal (the D* Lite arrangement), so g(s)
+    is the cost-to-goal and the start may move between calls. When an
+    edge is blocked only the vertices whose cost-to-goal actually change
+    are re-expanded; a replan after a single failed edge touches the
+    affected subtree instead of repeating a full A*.
+
+    State is kept per cached graph for the most recent goal.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._lpa: Dict[int, _LPAState] = {}
+
+    # -------------------------------
+    # Edge change tracking
+    # -------------------------------
+
+    def _set_edge_blocked(self, cached: _CachedGraph, i: int, blocked: bool) -> None:
+        super()._set_edge_blocked(cached, i, blocked)
+
+        state = self._lpa.get(id(cached))
+        if state is not None:
+            data = cached.edge_data[i]
+            state.changed.add((data["from"], data["to"]))
+
+    # -------------------------------
+    # LPA* core
+    # -------------------------------
+
+    def _key(self, cached: _CachedGraph, state: _LPAState, start: str, s: str) -> Key:
+        k = min(state.g.get(s, INF), state.rhs.get(s, INF))
+        return (k + self._heuristic(cached, start, s) + state.km, k)
+
+    def _update_vertex(self, cached: _CachedGraph, state: _LPAState, start: str, u: str) -> None:
+        g, rhs = state.g, state.rhs
+
+        if u != state.goal:
+            best = INF
+            for v, data in cached.G._adj[u].items():
+                cost = data["weight"] + g.get(v, INF)
+                if cost < best:
+                    best = cost
+            rhs[u] = best
+
+        state.open_key.pop(u, None)
+        if g.get(u, INF) != rhs.get(u, INF):
+            key = self._key(cached, state, start, u)
+            state.open_key[u] = key
+            heappush(state.open_heap, (key, next(state.tie), u))
+
+    def _top_key(self, state: _LPAState) -> Key:
+        heap = state.open_heap
+        # Drop entries superseded by a later push or removal
+        while heap and state.open_key.get(heap[0][2]) != heap[0][0]:
+            heappop(heap)
+        return heap[0][0] if heap else (INF, INF)
+
+    def _compute_shortest_path(self, cached: _CachedGraph, state: _LPAState, start: str) -> None:
+        g, rhs = state.g, state.rhs
+        pred = cached.G._pred
+
+        while True:
+            top_key = self._top_key(state)
+            if not state.open_heap:  # every vertex is consistent
+                break
+            if (
+                not _key_le(top_key, self._key(cached, state, start, start))
+                and rhs.get(start, INF) == g.get(start, INF)
+            ):
+                break
+
+            k_old, _, u = heappop(state.open_heap)
+            del state.open_key[u]
+
+            k_new = self._key(cached, state, start, u)
+            if k_old < k_new:
+                state.open_key[u] = k_new
+                heappush(state.open_heap, (k_new, next(state.tie), u))
+            elif g.get(u, INF) > rhs.get(u, INF):
+                g[u] = rhs[u]
+                for p in pred[u]:
+                    self._update_vertex(cached, state, start, p)
+            else:
+                g[u] = INF
+                self._update_vertex(cached, state, start, u)
+                for p in pred[u]:
+                    self._update_vertex(cached, state, start, p)
+
+    def _state(self, cached: _CachedGraph, start: str, goal: str) -> _LPAState:
+        state = self._lpa.get(id(cached))
+
+        if state is None or state.goal != goal:
+            state = _LPAState(goal=goal, last_start=start)
+            state.rhs[goal] = 0.0
+            key = self._key(cached, state, start, goal)
+            state.open_key[goal] = key
+            heappush(state.open_heap, (key, next(state.tie), goal))
+            self._lpa[id(cached)] = state
+
+        else:
+            # Start moved since the keys in the queue were computed; this
+            # applies even without edge changes, as the queue may be non-empty
+            if start != state.last_start:
+                state.km += self._heuristic(cached, state.last_start, start)
+                state.last_start = start
+            for u, _ in state.changed:
+                self._update_vertex(cached, state, start, u)
+
+        state.changed.clear()
+        return state
+
+    def _search(self, cached: _CachedGraph, start: str, goal: str) -> List[str]:
+        for n in (start, goal):
+            if n not in cached.node_index:
+                raise nx.NodeNotFound(f"Node {n} is not in G")
+
+        state = self._state(cached, start, goal)
+        self._compute_shortest_path(cached, state, start)
+
+        g = state.g
+        if g.get(start, INF) == INF:
+            raise nx.NetworkXNoPath(f"Node {goal} not reachable from {start}")
+
+        # Greedy descent on cost-to-goal
+        path = [start]
+        node = start
+        for _ in range(len(cached.node_ids)):
+            if node == goal:
+                return path
+            node = min(
+                cached.G._adj[node].items(),
+                key=lambda item: item[1]["weight"] + g.get(item[0], INF)
+            )[0]
+            path.append(node)
+
+        raise nx.NetworkXNoPath(f"Node {goal} not reachable from {start}")
+
+    def plan_with_tree(
+        self,
+        graph: Dict[str, Any],
+        start: str,
+        goal: str,
+        context: Optional[Dict[str, Any]] = None
+    ) -> PlanResult:
+        # The incremental state already plays the role of the shared tree
+        return self.plan(graph, start, goal, context)
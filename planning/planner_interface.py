@@ -1,11 +1,19 @@
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 
 @dataclass
 class PlanResult:
-    nodes: List[str]
-    edges: List[Dict[str, Any]]  # each edge dict includes from, to, skill, cost
+    nodes: Tuple[str, ...]
+    # Path edges as parallel arrays; edge i goes from_arr[i] -> to_arr[i]
+    from_arr: Tuple[str, ...]
+    to_arr: Tuple[str, ...]
+    reliab_arr: Tuple[float, ...]
+    skill_arr: Tuple[Optional[str], ...]
+    cost_arr: Tuple[float, ...]
+    # Read-only edge payloads (from, to, skill, cost, ...) shared with the
+    # planner's graph; copy one before modifying it
+    edges: Tuple[Mapping[str, Any], ...] = ()
 
 
 class Planner:
@@ -17,3 +25,23 @@ class Planner:
         context: Optional[Dict[str, Any]] = None
     ) -> PlanResult:
         raise NotImplementedError
+
+    def plan_with_tree(
+        self,
+        graph: Dict[str, Any],
+        start: str,
+        goal: str,
+        context: Optional[Dict[str, Any]] = None
+    ) -> PlanResult:
+        """
+        Plan that may be served from a search tree shared by every goal
+        reachable from `start`. Defaults to plan().
+        """
+        return self.plan(graph, start, goal, context)
+
+    def block_edge(self, u: str, v: str) -> None:
+        """
+        Mark an edge as infeasible for subsequent plans (e.g. after a
+        failed traversal).
+        """
+        raise NotImplementedError
@@ -1,4 +1,6 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
 
 def plan_cleaning_tasks_from_vlm(vlm_output, graph):
     """
@@ -14,6 +16,18 @@ def plan_cleaning_tasks_from_vlm(vlm_output, graph):
     # Simple ordering for now (can be extended)
     return valid_targets
 
+PRIORITY_RANK = {
+    "high": 0,
+    "medium": 1,
+    "low": 2
+}
+
+# (id(graph), policy) -> (graph, ordered zone ids). The graph reference
+# keeps its id from being reused while the entry is alive.
+_ZONE_ORDER_CACHE: Dict[Tuple[int, str], Tuple[Dict[str, Any], List[str]]] = {}
+_ZONE_ORDER_CACHE_SIZE = 8
+
+
 def plan_cleaning_tasks(
     graph: Dict[str, Any],
     policy: str = "priority_first"
@@ -21,32 +35,39 @@ def plan_cleaning_tasks(
     """
     Decide which cleaning zones to visit and in what order.
     This is task-level reasoning, independent of navigation.
+
+    Results are cached per graph object and policy; build a new graph
+    dict rather than mutating one in place.
     """
 
+    key = (id(graph), policy)
+    cached = _ZONE_ORDER_CACHE.get(key)
+    if cached is not None and cached[0] is graph:
+        return list(cached[1])
+
     # Extract cleaning zones
     zones = [
         node for node in graph["nodes"]
         if node.get("type") == "cleaning_zone"
     ]
+    zone_ids = np.array([z["id"] for z in zones], dtype=object)
 
     if policy == "priority_first":
-        priority_rank = {
-            "high": 0,
-            "medium": 1,
-            "low": 2
-        }
-
-        zones.sort(
-            key=lambda z: priority_rank.get(
-                z.get("priority", "medium"), 1
-            )
+        ranks = np.array(
+            [PRIORITY_RANK.get(z.get("priority", "medium"), 1) for z in zones],
+            dtype=np.int8
         )
+        zone_ids = zone_ids[np.argsort(ranks, kind="stable")]
 
     elif policy == "high_only":
-        zones = [
-            z for z in zones
-            if z.get("priority") == "high"
-        ]
+        high = np.array([z.get("priority") == "high" for z in zones], dtype=bool)
+        zone_ids = zone_ids[high]
+
+    # Ordered list of zone IDs
+    order = zone_ids.tolist()
+
+    if len(_ZONE_ORDER_CACHE) >= _ZONE_ORDER_CACHE_SIZE:
+        _ZONE_ORDER_CACHE.pop(next(iter(_ZONE_ORDER_CACHE)))
+    _ZONE_ORDER_CACHE[key] = (graph, order)
 
-    # Return ordered list of zone IDs
-    return [z["id"] for z in zones]
+    return list(order)
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("numba")
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from planning.astar_numba import astar_csr
+
+
+def _path_cost(indptr, indices, weights, path):
+    cost = 0.0
+    for u, v in zip(path[:-1], path[1:]):
+        row = slice(indptr[u], indptr[u + 1])
+        cost += weights[row][indices[row] == v].min()
+    return cost
+
+
+def _random_case(rng):
+    """
+    Small random digraph with decimal weights (as in the world model) and
+    a consistent heuristic: scaled exact cost-to-goal.
+    """
+    n = int(rng.integers(2, 8))
+    n_edges = int(rng.integers(1, 3 * n))
+    src = rng.integers(0, n, n_edges)
+    dst = rng.integers(0, n, n_edges)
+    keep = src != dst
+    src, dst = src[keep], dst[keep]
+    weights = np.round(rng.uniform(0.01, 150.0, len(src)), 2)
+
+    order = np.argsort(src, kind="stable")
+    src, dst, weights = src[order], dst[order], weights[order]
+    indptr = np.concatenate(([0], np.cumsum(np.bincount(src, minlength=n)))).astype(np.int64)
+    indices = dst.astype(np.int64)
+
+    start, goal = (int(x) for x in rng.integers(0, n, 2))
+
+    to_goal = dijkstra(csr_matrix((weights, indices, indptr), shape=(n, n)).T, indices=goal)
+    finite = np.isfinite(to_goal)
+    h = np.where(finite, to_goal, to_goal[finite].max()) * rng.uniform(0.0, 1.0)
+    return indptr, indices, weights, h, start, goal, to_goal[start]
+
+
+def test_matches_dijkstra():
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        indptr, indices, weights, h, start, goal, cost = _random_case(rng)
+
+        path = astar_csr(indptr, indices, weights, h, start, goal)
+
+        if not np.isfinite(cost):
+            assert len(path) == 0
+            continue
+        assert path[0] == start and path[-1] == goal
+        assert _path_cost(indptr, indices, weights, path) == pytest.approx(cost, abs=1e-9)
@@ -0,0 +1,114 @@
+import math
+import random
+
+import networkx as nx
+import pytest
+
+from planning.astar_planner import NetworkXAStarPlanner
+from planning.lifelong_planner import LifelongAStarPlanner
+
+
+def _graph(coords, edges):
+    return {
+        "nodes": [{"id": f"n{i}", "x": x, "y": y} for i, (x, y) in enumerate(coords)],
+        "edges": [{"from": u, "to": v, "base_cost": c} for u, v, c in edges],
+    }
+
+
+def _random_graph(rng):
+    """
+    Small world model with integer coordinates and base costs rounded
+    near the euclidean length, so the heuristic is often tight (or tied
+    up to rounding) along an edge.
+    """
+    n = rng.randint(3, 6)
+    coords = [(rng.randint(0, 60), rng.randint(0, 60)) for _ in range(n)]
+    edges = []
+    for _ in range(rng.randint(n, 3 * n)):
+        u, v = rng.sample(range(n), 2)
+        cost = math.dist(coords[u], coords[v]) * rng.choice([1.0, 1.0, 1.3, 2.0])
+        edges.append((f"n{u}", f"n{v}", round(cost, rng.choice([1, 2, 3]))))
+    return _graph(coords, edges)
+
+
+def _replay(graph, steps):
+    """
+    Runs plan/block steps on a LifelongAStarPlanner and on the plain A*
+    planner, checking every plan against the reference cost.
+    """
+    lifelong, reference = LifelongAStarPlanner(), NetworkXAStarPlanner()
+    for op, u, v in steps:
+        if op == "block":
+            lifelong.block_edge(u, v)
+            reference.block_edge(u, v)
+            continue
+
+        try:
+            want = reference.plan(graph, u, v)
+        except nx.NetworkXNoPath:
+            with pytest.raises(nx.NetworkXNoPath):
+                lifelong.plan(graph, u, v)
+            continue
+
+        got = lifelong.plan(graph, u, v)
+        assert got.nodes[0] == u and got.nodes[-1] == v
+        assert sum(got.cost_arr) == pytest.approx(sum(want.cost_arr), abs=1e-9)
+
+
+def test_tied_key_does_not_end_search_early():
+    # The top key and key(start) differ only by rounding after the second
+    # block; the search used to stop before repairing g(start)
+    graph = _graph(
+        [(18, 26), (14, 2), (24, 33), (48, 18)],
+        [
+            ("n0", "n2", 9.22), ("n2", "n3", 36.79), ("n0", "n3", 40.4),
+            ("n1", "n2", 65.15), ("n3", "n2", 28.302), ("n1", "n3", 75.2),
+            ("n2", "n3", 28.302), ("n3", "n0", 62.097), ("n2", "n0", 9.22),
+            ("n3", "n1", 75.15), ("n1", "n2", 65.146),
+        ],
+    )
+    _replay(graph, [
+        ("plan", "n2", "n1"),
+        ("block", "n1", "n2"),
+        ("plan", "n2", "n1"),
+        ("block", "n3", "n1"),
+        ("plan", "n2", "n1"),
+    ])
+
+
+def test_start_moves_between_replans():
+    # The start moves on the second plan without any edge change; the
+    # queued keys must still be offset by km for the later replans
+    graph = _graph(
+        [(16, 47), (5, 40), (8, 58), (33, 38)],
+        [
+            ("n2", "n0", 27.203), ("n0", "n3", 38.471), ("n0", "n2", 13.6),
+            ("n3", "n1", 36.493), ("n2", "n1", 18.2), ("n1", "n2", 18.2),
+            ("n1", "n3", 28.1), ("n1", "n0", 26.1), ("n3", "n0", 19.2),
+            ("n1", "n3", 36.493), ("n1", "n3", 28.071),
+        ],
+    )
+    _replay(graph, [
+        ("plan", "n3", "n3"),
+        ("block", "n0", "n3"),
+        ("plan", "n0", "n3"),
+        ("block", "n1", "n3"),
+        ("plan", "n3", "n3"),
+        ("block", "n1", "n3"),
+        ("plan", "n2", "n3"),
+    ])
+
+
+def test_matches_astar_across_replans():
+    rng = random.Random(0)
+    for _ in range(3000):
+        graph = _random_graph(rng)
+        ids = [n["id"] for n in graph["nodes"]]
+        goal = rng.choice(ids)
+
+        steps = []
+        for _ in range(4):
+            steps.append(("plan", rng.choice(ids), goal))
+            edge = rng.choice(graph["edges"])
+            steps.append(("block", edge["from"], edge["to"]))
+        _replay(graph, steps)
@@ -4,17 +4,36 @@
 
 import numpy as np
 import json
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Tuple, Optional
-from collections import defaultdict
-import heapq
+from dataclasses import dataclass, asdict, field
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Dict, Tuple, Optional
 from pathlib import Path
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+from scipy.spatial import cKDTree
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; save() falls back to stdlib json
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; AStarPlanner falls back to scipy's Dijkstra
+    njit = None
+
+
+def _jit(fn):
+    """Compile with numba when it is available, otherwise leave as Python"""
+    return njit(cache=True)(fn) if njit is not None else fn
 
 # ============================================================================
 # DATA STRUCTURES
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Pose2D:
     """Robot pose in 2D space"""
     x: float
@@ -25,14 +44,16 @@ class Pose2D:
         """Euclidean distance to another pose"""
         return np.sqrt((self.x - other.x)**2 + (self.y - other.y)**2)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GraphNode:
     """Node in topological graph"""
     id: int
     pose: Pose2D
     semantic_label: Optional[str] = None
     zone_id: Optional[str] = None
-    image_embedding: Optional[List[float]] = None  # CLIP embedding (simulated)
+    # CLIP embedding (simulated), float32; left out of eq/hash, which
+    # would otherwise compare arrays elementwise
+    image_embedding: Optional[np.ndarray] = field(default=None, compare=False)
     
     def to_dict(self) -> Dict:
         return {
@@ -40,46 +61,77 @@ class GraphNode:
             'pose': asdict(self.pose),
             'semantic_label': self.semantic_label,
             'zone_id': self.zone_id,
-            'embedding_dim': len(self.image_embedding) if self.image_embedding else 0
+            'embedding_dim': len(self.image_embedding) if self.image_embedding is not None else 0
         }
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GraphEdge:
     """Edge between nodes"""
     from_node: int
     to_node: int
     weight: float  # traversal cost (distance or time)
     traversable: bool = True
-    cleaning_compatible: List[str] = None  # modes allowed on this edge
+    cleaning_compatible: Optional[Tuple[str, ...]] = None  # modes allowed on this edge
     
     def __post_init__(self):
-        if self.cleaning_compatible is None:
-            self.cleaning_compatible = ["sweep", "vacuum", "scrub"]
+        # Stored as a tuple so edges stay hashable; frozen dataclass, so
+        # bypass the generated __setattr__
+        modes = self.cleaning_compatible
+        if modes is None:
+            modes = ("sweep", "vacuum", "scrub")
+        object.__setattr__(self, 'cleaning_compatible', tuple(modes))
 
 # ============================================================================
 # COMPONENT 1: SIMPLIFIED PERCEPTION & MAPPING PIPELINE
 # ============================================================================
 
+def _quantize(v: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    L2-normalize embeddings (last axis) and quantize to int8 with one
+    scale per vector: v_normalized ~= q * scale.
+    
+    Returns:
+        (q int8 array, scale float32 array with v's leading shape)
+    """
+    v = np.asarray(v, dtype=np.float32)
+    v = v / np.maximum(np.linalg.norm(v, axis=-1, keepdims=True), 1e-12)
+    scale = np.maximum(np.abs(v).max(axis=-1, keepdims=True), 1e-12) / 127.0
+    q = np.round(v / scale).astype(np.int8)
+    return q, scale[..., 0].astype(np.float32)
+
+
 class DemoTourProcessor:
     """
     Processes demo tour video to extract keyframes and build spatial structure.
     Simplified version using frame sampling instead of full SfM.
     """
     
-    def __init__(self, frame_sample_rate: float = 0.5):
+    def __init__(self, frame_sample_rate: float = 0.5, clip_model: str = "ViT-B/32",
+                 embed_batch_size: int = 64, preprocess_workers: int = 16):
         """
         Args:
             frame_sample_rate: Keyframes per second to extract
+            clip_model: CLIP variant used to embed real frames
+            embed_batch_size: Frames per CLIP forward pass
+            preprocess_workers: Threads for per-frame color conversion + CLIP preprocessing
         """
         self.frame_sample_rate = frame_sample_rate
+        self.clip_model = clip_model
+        self.embed_batch_size = embed_batch_size
+        self.preprocess_workers = preprocess_workers
         self.keyframes = []
+        # int8 copy of the keyframe embeddings for retrieval, row i <-> keyframe i
+        self.embeddings_q = np.zeros((0, 512), dtype=np.int8)
+        self.embedding_scales = np.zeros(0, dtype=np.float32)
+        self._clip = None  # (model, preprocess, device), loaded on first use
         
     def process_video(self, video_path: str, trajectory: List[Pose2D] = None) -> List[Dict]:
         """
-        Simulate video processing. In real implementation, would use:
-        - OpenCV for frame extraction
-        - CLIP for image embeddings
-        - Visual odometry or manual annotations for poses
+        Process a tour video. Frames are sampled with OpenCV when it is
+        installed and the video exists, and embedded with CLIP when torch
+        and CLIP are installed; otherwise the tour is simulated. Poses come
+        from `trajectory` (visual odometry or manual annotations) or a
+        synthetic path.
         
         Args:
             video_path: Path to demo tour video
@@ -90,40 +142,161 @@ class DemoTourProcessor:
         """
         print(f"[DemoTourProcessor] Processing video: {video_path}")
         
-        # Simulate: Extract frames at sample rate
-        # Real: cv2.VideoCapture, frame extraction
-        video_duration = 120  # assume 2-minute tour
-        num_frames = int(video_duration * self.frame_sample_rate)
+        # Stream frames at sample rate from the real video if we can and
+        # embed them with CLIP as they are decoded
+        sampled = self._sample_frames(video_path)
+        encoded = self._encode_frames(sampled) if sampled is not None else None
+        if encoded is not None:
+            embeddings, timestamps = encoded
+        elif sampled is not None:
+            # Real tour without CLIP: its frames still set count and timing
+            timestamps = [t for _, t in sampled]
+        else:
+            video_duration = 120  # assume 2-minute tour
+            timestamps = [i / self.frame_sample_rate for i in range(int(video_duration * self.frame_sample_rate))]
+        num_frames = len(timestamps)
+        
+        # CLIP embeddings as one contiguous float32 block, simulated (512-dim)
+        # without real frames or CLIP. Only the int8 copy is kept; each
+        # keyframe holds a row view of it.
+        if encoded is None:
+            embeddings = np.random.default_rng().standard_normal((num_frames, 512), dtype=np.float32)
+        embeddings_q, scales = _quantize(embeddings)
+        del embeddings
+        
+        # Synthetic trajectory (straight line + turns) for frames without a
+        # supplied pose, computed for all frames at once
+        n_given = min(len(trajectory), num_frames) if trajectory else 0
+        t = np.arange(n_given, num_frames) / num_frames
+        phase = 2 * np.pi * t * 2
+        x = t * 50  # 50 meters total
+        y = 5 * np.sin(phase)  # sinusoidal path
+        theta = np.arctan2(np.cos(phase), 1)
+        poses = list(trajectory[:n_given]) if n_given else []
+        poses += [Pose2D(xi, yi, ti) for xi, yi, ti in zip(x.tolist(), y.tolist(), theta.tolist())]
         
         keyframes = []
         for i in range(num_frames):
             # Simulate keyframe data
-            if trajectory and i < len(trajectory):
-                pose = trajectory[i]
-            else:
-                # Generate synthetic trajectory (straight line + turns)
-                t = i / num_frames
-                x = t * 50  # 50 meters total
-                y = 5 * np.sin(2 * np.pi * t * 2)  # sinusoidal path
-                theta = np.arctan2(np.cos(2 * np.pi * t * 2), 1)
-                pose = Pose2D(x, y, theta)
-            
-            # Simulate CLIP embedding (512-dim vector)
-            # Real: clip_model.encode_image(frame)
-            embedding = np.random.randn(512).tolist()
+            pose = poses[i]
             
             keyframe = {
                 'frame_id': i,
-                'timestamp': i / self.frame_sample_rate,
+                'timestamp': timestamps[i],
                 'pose': pose,
-                'embedding': embedding,
+                'embedding_q': embeddings_q[i],
+                'embedding_scale': float(scales[i]),
                 'image_path': f"frame_{i:04d}.jpg"  # would be real path
             }
             keyframes.append(keyframe)
         
         self.keyframes = keyframes
+        self.embeddings_q = embeddings_q
+        self.embedding_scales = scales
         print(f"[DemoTourProcessor] Extracted {len(keyframes)} keyframes")
         return keyframes
+    
+    def match_keyframes(self, query_embedding: np.ndarray, top_k: int = 5) -> List[int]:
+        """
+        Visual place recognition over the int8 embeddings: frame ids of the
+        top_k keyframes by cosine similarity to query_embedding.
+        """
+        query_q, _ = _quantize(query_embedding)
+        # Accumulate in int32; the query's own scale does not change the ranking
+        scores = (self.embeddings_q.astype(np.int32) @ query_q.astype(np.int32)) * self.embedding_scales
+        top = np.argsort(-scores, kind='stable')[:top_k]
+        return [self.keyframes[i]['frame_id'] for i in top.tolist()]
+    
+    def _encode_frames(self, frames: Iterable[Tuple[np.ndarray, float]]) -> Optional[Tuple[np.ndarray, List[float]]]:
+        """
+        Embed (frame, timestamp) pairs with CLIP in batches (one encode_image
+        call per batch, no autograd, mixed precision on GPU). Frames are
+        pulled from `frames` only as the preprocessing window has room.
+        
+        Returns:
+            ((N, D) float32 array, N timestamps), or None if torch/CLIP are
+            unavailable (frames is then left unconsumed) or there are no frames
+        """
+        try:
+            import torch
+            import clip
+            from PIL import Image
+        except ImportError:
+            return None
+        
+        if self._clip is None:
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            model, preprocess = clip.load(self.clip_model, device=device)
+            model.eval()
+            self._clip = (model, preprocess, device)
+        model, preprocess, device = self._clip
+        
+        def prepare(frame: np.ndarray):
+            # OpenCV frames are BGR
+            return preprocess(Image.fromarray(np.ascontiguousarray(frame[..., ::-1])))
+        
+        # PIL/OpenCV release the GIL, so frames are prepared on a thread pool
+        # while the next ones are decoded and earlier batches are encoded;
+        # futures keep frame order. Only two batches are decoded and prepared
+        # ahead of encode_image, so host memory stays bounded.
+        frames = iter(frames)
+        batch_size = self.embed_batch_size
+        out, timestamps = [], []
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=max(1, self.preprocess_workers)) as ex:
+            def submit(n: int):
+                for frame, t in islice(frames, n):
+                    pending.append(ex.submit(prepare, frame))
+                    timestamps.append(t)
+            
+            submit(2 * batch_size)
+            while pending:
+                tensors = [pending.popleft().result() for _ in range(min(batch_size, len(pending)))]
+                submit(len(tensors))
+                
+                batch = torch.stack(tensors).to(device)
+                with torch.no_grad(), torch.autocast(device_type=device, enabled=device == "cuda"):
+                    out.append(model.encode_image(batch).float().cpu().numpy())
+        if not out:
+            return None
+        return np.concatenate(out).astype(np.float32, copy=False), timestamps
+    
+    def _sample_frames(self, video_path: str) -> Optional[Iterator[Tuple[np.ndarray, float]]]:
+        """
+        Stream the frames we keep: grab() advances the stream without
+        decoding, retrieve() decodes the sampled ones as they are consumed.
+        
+        Returns:
+            Iterator of (frame, timestamp), or None if OpenCV or the video
+            is unavailable
+        """
+        if not Path(video_path).is_file():
+            return None
+        try:
+            import cv2
+        except ImportError:
+            return None
+        
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            return None
+        
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        stride = max(1, int(fps / self.frame_sample_rate))
+        
+        def frames():
+            idx = 0
+            try:
+                while cap.grab():
+                    if idx % stride == 0:
+                        ok, frame = cap.retrieve()
+                        if ok:
+                            yield frame, idx / fps
+                    idx += 1
+            finally:
+                cap.release()
+        
+        return frames()
 
 
 class TopologicalGraphBuilder:
@@ -171,64 +344,39 @@ class TopologicalGraphBuilder:
                 pose=frame['pose'],
                 semantic_label=f"Location_{i}",
                 zone_id=zone,
-                image_embedding=frame['embedding'][:64]  # truncate for demo
+                # Dequantized, truncated for demo
+                image_embedding=frame['embedding_q'][:64] * np.float32(frame['embedding_scale'])
             )
             nodes.append(node)
         
         # Step 3: Create edges based on spatial proximity
-        edges = []
-        for i, node_i in enumerate(nodes):
-            for j, node_j in enumerate(nodes):
-                if i >= j:
-                    continue
-                    
-                dist = node_i.pose.distance_to(node_j.pose)
-                
-                # Connect nearby nodes
-                if dist < self.distance_threshold:
-                    edge = GraphEdge(
-                        from_node=i,
-                        to_node=j,
-                        weight=dist,
-                        traversable=True
-                    )
-                    edges.append(edge)
-                    
-                    # Also add reverse edge (undirected graph)
-                    edge_reverse = GraphEdge(
-                        from_node=j,
-                        to_node=i,
-                        weight=dist,
-                        traversable=True
-                    )
-                    edges.append(edge_reverse)
+        # Fixed-radius neighbour search on a KD-tree instead of all N^2 pairs
+        xy = np.array([[node.pose.x, node.pose.y] for node in nodes], dtype=np.float64).reshape(-1, 2)
+        tree = cKDTree(xy)
+        
+        pairs = tree.query_pairs(r=self.distance_threshold, output_type='ndarray')
+        diff = xy[pairs[:, 0]] - xy[pairs[:, 1]]
+        dists = np.sqrt((diff * diff).sum(-1))
+        # query_pairs includes r itself; keep pairs in (i, j) order
+        keep = dists < self.distance_threshold
+        pairs, dists = pairs[keep], dists[keep]
+        order = np.lexsort((pairs[:, 1], pairs[:, 0]))
+        pairs, dists = pairs[order], dists[order]
         
         # Step 4: Ensure graph connectivity (add edges to nearest neighbor if isolated)
-        adjacency = defaultdict(list)
-        for edge in edges:
-            adjacency[edge.from_node].append(edge.to_node)
-        
-        for i, node in enumerate(nodes):
-            if i not in adjacency or len(adjacency[i]) == 0:
-                # Find nearest node
-                min_dist = float('inf')
-                nearest = None
-                for j, other in enumerate(nodes):
-                    if i == j:
-                        continue
-                    dist = node.pose.distance_to(other.pose)
-                    if dist < min_dist:
-                        min_dist = dist
-                        nearest = j
-                
-                if nearest is not None:
-                    edges.append(GraphEdge(i, nearest, min_dist, True))
-                    edges.append(GraphEdge(nearest, i, min_dist, True))
+        degree = np.bincount(pairs.ravel(), minlength=len(nodes))
+        isolated = np.flatnonzero(degree == 0)
+        if len(nodes) > 1 and len(isolated) > 0:
+            # k=2: the closest hit is the node itself
+            nn_dist, nn_idx = tree.query(xy[isolated], k=2)
+            pairs = np.concatenate((pairs, np.column_stack((isolated, nn_idx[:, 1]))))
+            dists = np.concatenate((dists, nn_dist[:, 1]))
         
-        print(f"[GraphBuilder] Created {len(nodes)} nodes, {len(edges)} edges")
+        # Each undirected pair becomes an edge in both directions
+        print(f"[GraphBuilder] Created {len(nodes)} nodes, {2 * len(pairs)} edges")
         
         # Step 5: Create graph object
-        graph = TopologicalGraph(nodes, edges)
+        graph = TopologicalGraph(nodes, pairs, dists)
         return graph
 
 
@@ -237,61 +385,123 @@ class TopologicalGraph:
     Topological graph data structure with spatial indexing.
     """
     
-    def __init__(self, nodes: List[GraphNode], edges: List[GraphEdge]):
+    def __init__(self, nodes: List[GraphNode], undirected_pairs: np.ndarray, weights: np.ndarray):
+        """
+        Args:
+            nodes: Graph nodes
+            undirected_pairs: (E, 2) node ids, one row per undirected edge
+            weights: (E,) traversal cost of each pair
+        """
         self.nodes = {node.id: node for node in nodes}
-        self.edges = edges
+        self._pairs = np.asarray(undirected_pairs, dtype=np.int64).reshape(-1, 2)
+        self._pair_w = np.asarray(weights, dtype=np.float64).reshape(-1)
+        self._edges = None  # GraphEdge list, built on first access
+        
+        # Node poses as flat arrays (row i <-> self._ids[i]); planners and
+        # spatial queries read these instead of per-node Pose2D objects
+        self._ids = np.array(list(self.nodes.keys()), dtype=np.int64)
+        self._id_to_idx = {node_id: i for i, node_id in enumerate(self.nodes)}
+        self._xy = np.array([[node.pose.x, node.pose.y] for node in self.nodes.values()],
+                            dtype=np.float64).reshape(-1, 2)
+        self._theta = np.array([node.pose.theta for node in self.nodes.values()], dtype=np.float64)
         
-        # Build adjacency list for fast lookup
-        self.adjacency = defaultdict(list)
-        for edge in edges:
-            self.adjacency[edge.from_node].append({
-                'to': edge.to_node,
-                'weight': edge.weight,
-                'traversable': edge.traversable
-            })
+        # Spatial index over node positions for nearest-node queries
+        self._tree = cKDTree(self._xy)
+        
+        # CSR adjacency over node rows: the out-edges of row i are
+        # _edge_to / _edge_w / _edge_trav[_indptr[i]:_indptr[i + 1]].
+        # Both directions of each pair, interleaved (i->j, j->i) so each
+        # row keeps its neighbours in pair order.
+        by_id = np.argsort(self._ids)
+        rows = by_id[np.searchsorted(self._ids, self._pairs, sorter=by_id)]
+        edge_from = rows.ravel()
+        edge_to = rows[:, ::-1].ravel()
+        order = np.argsort(edge_from, kind='stable')
+        self._edge_to = edge_to[order]
+        self._edge_w = np.repeat(self._pair_w, 2)[order]
+        self._edge_trav = np.ones(len(order), dtype=np.bool_)
+        self._indptr = np.concatenate(
+            ([0], np.cumsum(np.bincount(edge_from, minlength=len(self.nodes))))
+        ).astype(np.int64)
+        
+        # Same adjacency restricted to traversable edges, as a scipy CSR
+        # matrix for the csgraph routines
+        edge_rows = np.repeat(np.arange(len(self.nodes)), np.diff(self._indptr))
+        trav = self._edge_trav
+        self._csr = csr_matrix(
+            (self._edge_w[trav], self._edge_to[trav],
+             np.concatenate(([0], np.cumsum(np.bincount(edge_rows[trav], minlength=len(self.nodes)))))),
+            shape=(len(self.nodes), len(self.nodes))
+        )
+    
+    @property
+    def edges(self) -> List[GraphEdge]:
+        """Directed GraphEdges (both directions per pair), materialized on first use"""
+        if self._edges is None:
+            self._edges = []
+            for (i, j), w in zip(self._pairs.tolist(), self._pair_w.tolist()):
+                self._edges.append(GraphEdge(from_node=i, to_node=j, weight=w, traversable=True))
+                self._edges.append(GraphEdge(from_node=j, to_node=i, weight=w, traversable=True))
+        return self._edges
     
     def get_node(self, node_id: int) -> Optional[GraphNode]:
         """Get node by ID"""
         return self.nodes.get(node_id)
     
-    def get_neighbors(self, node_id: int) -> List[Dict]:
-        """Get neighbors of a node"""
-        return self.adjacency[node_id]
+    def pose_of(self, node_id: int) -> Pose2D:
+        """Pose of a node, read from the pose arrays"""
+        i = self._id_to_idx[node_id]
+        return Pose2D(float(self._xy[i, 0]), float(self._xy[i, 1]), float(self._theta[i]))
+    
+    def get_neighbors(self, node_id: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get neighbors of a node as (node ids, weights, traversable) arrays"""
+        i = self._id_to_idx[node_id]
+        lo, hi = self._indptr[i], self._indptr[i + 1]
+        return self._ids[self._edge_to[lo:hi]], self._edge_w[lo:hi], self._edge_trav[lo:hi]
     
     def find_nearest_node(self, pose: Pose2D) -> int:
         """Find nearest node to a given pose"""
-        min_dist = float('inf')
-        nearest = None
-        for node_id, node in self.nodes.items():
-            dist = node.pose.distance_to(pose)
-            if dist < min_dist:
-                min_dist = dist
-                nearest = node_id
-        return nearest
+        if len(self._ids) == 0:
+            return None
+        _, idx = self._tree.query([pose.x, pose.y], k=1)
+        return int(self._ids[idx])
     
-    def save(self, filepath: str):
-        """Save graph to JSON file"""
-        data = {
+    def _save_data(self) -> Dict:
+        return {
             'nodes': [node.to_dict() for node in self.nodes.values()],
             'edges': [asdict(edge) for edge in self.edges]
         }
+    
+    def save(self, filepath: str):
+        """Save graph to compact JSON file"""
+        data = self._save_data()
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(filepath, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+        print(f"[Graph] Saved to {filepath}")
+    
+    def save_pretty(self, filepath: str):
+        """Save graph to indented JSON file, for reading and diffing"""
         with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+            json.dump(self._save_data(), f, indent=2)
         print(f"[Graph] Saved to {filepath}")
     
     def visualize_ascii(self):
         """Simple ASCII visualization of graph structure"""
         print("\n[Graph Visualization]")
         print(f"Nodes: {len(self.nodes)}")
-        print(f"Edges: {len(self.edges)}")
+        print(f"Edges: {2 * len(self._pairs)}")
         print("\nNode Positions:")
         for node_id, node in sorted(self.nodes.items())[:10]:  # show first 10
             print(f"  Node {node_id}: ({node.pose.x:.1f}, {node.pose.y:.1f}) - {node.zone_id or 'no zone'}")
         print(f"  ... ({len(self.nodes) - 10} more nodes)" if len(self.nodes) > 10 else "")
         
         print("\nConnectivity Sample:")
-        for node_id in list(self.adjacency.keys())[:5]:
-            neighbors = [n['to'] for n in self.adjacency[node_id]]
+        for node_id in [n for n in self.nodes if len(self.get_neighbors(n)[0])][:5]:
+            neighbors = self.get_neighbors(node_id)[0].tolist()
             print(f"  Node {node_id} -> {neighbors}")
 
 
@@ -299,7 +509,7 @@ class TopologicalGraph:
 # COMPONENT 2: NAVIGATION PLANNER OVER GRAPH
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PathPlan:
     """Represents a planned path"""
     node_sequence: List[int]
@@ -313,6 +523,119 @@ class PathPlan:
                 f"time={self.estimated_time:.1f}s)")
 
 
+@_jit
+def _heap_push(heap_f, heap_n, size, f, n):
+    i = size
+    heap_f[i] = f
+    heap_n[i] = n
+    while i > 0:
+        parent = (i - 1) >> 1
+        if heap_f[parent] <= heap_f[i]:
+            break
+        heap_f[parent], heap_f[i] = heap_f[i], heap_f[parent]
+        heap_n[parent], heap_n[i] = heap_n[i], heap_n[parent]
+        i = parent
+    return size + 1
+
+
+@_jit
+def _heap_pop(heap_f, heap_n, size):
+    n = heap_n[0]
+    size -= 1
+    heap_f[0] = heap_f[size]
+    heap_n[0] = heap_n[size]
+    i = 0
+    while True:
+        left = 2 * i + 1
+        if left >= size:
+            break
+        child = left
+        if left + 1 < size and heap_f[left + 1] < heap_f[left]:
+            child = left + 1
+        if heap_f[i] <= heap_f[child]:
+            break
+        heap_f[child], heap_f[i] = heap_f[i], heap_f[child]
+        heap_n[child], heap_n[i] = heap_n[i], heap_n[child]
+        i = child
+    return n, size
+
+
+@_jit
+def _astar(indptr, neigh_to, neigh_w, neigh_trav, h, start, goal):
+    """
+    A* over CSR adjacency; h[v] is the heuristic from row v to goal.
+    Returns (path rows, total cost); the path is empty if goal is unreachable.
+    """
+    n_nodes = indptr.shape[0] - 1
+    g = np.full(n_nodes, np.inf)
+    parent = np.full(n_nodes, -1, dtype=np.int64)
+    closed = np.zeros(n_nodes, dtype=np.bool_)
+    
+    # Lazy-deletion heap: every successful relaxation pushes once
+    capacity = neigh_to.shape[0] + 1
+    heap_f = np.empty(capacity, dtype=np.float64)
+    heap_n = np.empty(capacity, dtype=np.int64)
+    
+    g[start] = 0.0
+    size = _heap_push(heap_f, heap_n, 0, 0.0, start)
+    
+    while size > 0:
+        u, size = _heap_pop(heap_f, heap_n, size)
+        if closed[u]:
+            continue
+        if u == goal:
+            break
+        closed[u] = True
+        
+        for k in range(indptr[u], indptr[u + 1]):
+            if not neigh_trav[k]:
+                continue
+            v = neigh_to[k]
+            g_v = g[u] + neigh_w[k]
+            if g_v < g[v]:
+                g[v] = g_v
+                parent[v] = u
+                size = _heap_push(heap_f, heap_n, size, g_v + h[v], v)
+    
+    if g[goal] == np.inf:
+        return np.empty(0, dtype=np.int64), np.inf
+    
+    length = 1
+    node = goal
+    while node != start:
+        node = parent[node]
+        length += 1
+    path = np.empty(length, dtype=np.int64)
+    node = goal
+    for i in range(length - 1, -1, -1):
+        path[i] = node
+        node = parent[node]
+    return path, g[goal]
+
+
+def _warmup_astar() -> bool:
+    """
+    Compile _astar on a 2-node graph with the argument types plan() uses,
+    so the JIT cost is paid at import instead of on the first replan. With
+    cache=True later runs load the compiled code from __pycache__.
+    
+    Returns:
+        True if the compiled kernel is usable
+    """
+    if njit is None:
+        return False
+    try:
+        _astar(np.array([0, 1, 1], dtype=np.int64), np.array([1], dtype=np.int64),
+               np.array([1.0]), np.array([True]), np.zeros(2), 0, 1)
+    except Exception as e:
+        print(f"[Planner] numba A* unavailable ({e}), using scipy Dijkstra")
+        return False
+    return True
+
+
+_ASTAR_READY = _warmup_astar()
+
+
 class AStarPlanner:
     """
     A* path planner on topological graph.
@@ -326,10 +649,14 @@ class AStarPlanner:
         """
         self.graph = graph
         self.robot_speed = robot_speed
+        # Euclidean distance from every node row to the last goal
+        self._h_goal = None
+        self._h = None
     
     def plan(self, start_node: int, goal_node: int) -> Optional[PathPlan]:
         """
-        Plan path from start to goal using A*.
+        Plan path from start to goal using A* (numba), or scipy's
+        Dijkstra when numba is not installed.
         
         Args:
             start_node: Starting node ID
@@ -342,56 +669,41 @@ class AStarPlanner:
             print(f"[Planner] Invalid start or goal node")
             return None
         
-        # A* implementation
-        open_set = [(0, start_node)]  # (f_score, node)
-        came_from = {}
-        g_score = {start_node: 0}
-        
-        goal_pose = self.graph.nodes[goal_node].pose
+        # Search over node rows of the CSR adjacency
+        graph = self.graph
+        indptr, edge_to, edge_w, edge_trav = graph._indptr, graph._edge_to, graph._edge_w, graph._edge_trav
+        start = graph._id_to_idx[start_node]
+        goal = graph._id_to_idx[goal_node]
         
-        while open_set:
-            _, current = heapq.heappop(open_set)
-            
-            if current == goal_node:
-                # Reconstruct path
-                path = []
-                while current in came_from:
-                    path.append(current)
-                    current = came_from[current]
-                path.append(start_node)
-                path.reverse()
-                
-                return self._build_path_plan(path)
-            
-            # Explore neighbors
-            for neighbor_info in self.graph.get_neighbors(current):
-                neighbor = neighbor_info['to']
-                if not neighbor_info['traversable']:
-                    continue
-                
-                tentative_g = g_score[current] + neighbor_info['weight']
-                
-                if neighbor not in g_score or tentative_g < g_score[neighbor]:
-                    came_from[neighbor] = current
-                    g_score[neighbor] = tentative_g
-                    
-                    # Heuristic: Euclidean distance to goal
-                    h = self.graph.nodes[neighbor].pose.distance_to(goal_pose)
-                    f = tentative_g + h
-                    
-                    heapq.heappush(open_set, (f, neighbor))
+        if _ASTAR_READY:
+            # Heuristic for all nodes in one vector pass, reused while the goal holds
+            if self._h_goal != goal_node:
+                diff = graph._xy - graph._xy[goal]
+                self._h = np.sqrt((diff * diff).sum(-1))
+                self._h_goal = goal_node
+            path, _ = _astar(indptr, edge_to, edge_w, edge_trav, self._h, start, goal)
+            if len(path) > 0:
+                return self._build_path_plan(graph._ids[path].tolist())
+        else:
+            # Without numba, scipy's C Dijkstra beats a Python A* at this size
+            dist, pred = dijkstra(graph._csr, indices=start, return_predecessors=True)
+            if np.isfinite(dist[goal]):
+                path = [goal]
+                while path[-1] != start:
+                    path.append(pred[path[-1]])
+                return self._build_path_plan(graph._ids[path[::-1]].tolist())
         
         print(f"[Planner] No path found from {start_node} to {goal_node}")
         return None
     
     def _build_path_plan(self, node_sequence: List[int]) -> PathPlan:
         """Build PathPlan object from node sequence"""
-        waypoints = [self.graph.nodes[nid].pose for nid in node_sequence]
+        waypoints = [self.graph.pose_of(nid) for nid in node_sequence]
         
         # Calculate total distance
-        total_distance = 0
-        for i in range(len(waypoints) - 1):
-            total_distance += waypoints[i].distance_to(waypoints[i+1])
+        idx = [self.graph._id_to_idx[nid] for nid in node_sequence]
+        seg = np.diff(self.graph._xy[idx], axis=0)
+        total_distance = float(np.sqrt((seg * seg).sum(-1)).sum())
         
         estimated_time = total_distance / self.robot_speed
         
@@ -427,37 +739,52 @@ class MultiGoalPlanner:
         if not goal_nodes:
             return None
         
-        # Greedy nearest-neighbor heuristic
-        current = start_node
-        remaining = set(goal_nodes)
+        graph = self.graph
+        if start_node not in graph.nodes:
+            print("[Planner] Invalid start or goal node")
+            return None
+        
+        # One multi-source Dijkstra from the start and every goal gives all
+        # the pairwise distances the greedy tour needs
+        unknown = [g for g in dict.fromkeys(goal_nodes) if g not in graph.nodes]
+        for _ in unknown:
+            print("[Planner] Invalid start or goal node")
+        sources = list(dict.fromkeys([start_node] + [g for g in goal_nodes if g in graph.nodes]))
+        rows = [graph._id_to_idx[n] for n in sources]
+        dist, pred = dijkstra(graph._csr, indices=rows, return_predecessors=True)
+        dist_mat = dist[:, rows]
+        
+        # Greedy nearest-neighbor heuristic on the distance matrix
+        current = 0  # index into sources
+        remaining = list(range(1, len(sources)))
         full_path = [start_node]
         total_distance = 0
         
         while remaining:
             # Find nearest unvisited goal
-            best_goal = None
-            best_dist = float('inf')
-            best_subpath = None
+            k = int(np.argmin(dist_mat[current, remaining]))
+            best = remaining[k]
+            best_dist = dist_mat[current, best]
             
-            for goal in remaining:
-                subpath = self.planner.plan(current, goal)
-                if subpath and subpath.total_distance < best_dist:
-                    best_dist = subpath.total_distance
-                    best_goal = goal
-                    best_subpath = subpath
-            
-            if best_goal is None:
-                print(f"[MultiGoalPlanner] Cannot reach remaining goals")
+            if not np.isfinite(best_dist):
                 break
             
-            # Add to path (skip first node to avoid duplicates)
-            full_path.extend(best_subpath.node_sequence[1:])
-            total_distance += best_subpath.total_distance
-            current = best_goal
-            remaining.remove(best_goal)
+            # Walk the predecessor row back from the goal (skip first node to avoid duplicates)
+            segment = []
+            node = rows[best]
+            while node != rows[current]:
+                segment.append(node)
+                node = pred[current, node]
+            full_path.extend(graph._ids[segment[::-1]].tolist())
+            total_distance += float(best_dist)
+            current = best
+            remaining.pop(k)
+        
+        if remaining or unknown:
+            print("[MultiGoalPlanner] Cannot reach remaining goals")
         
         # Build final path plan
-        waypoints = [self.graph.nodes[nid].pose for nid in full_path]
+        waypoints = [self.graph.pose_of(nid) for nid in full_path]
         estimated_time = total_distance / self.planner.robot_speed
         
         return PathPlan(